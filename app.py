@@ -1,32 +1,64 @@
-from flask import Flask, render_template, url_for, request, jsonify
-from dotenv import load_dotenv
-from call_Azure_endpoints import call_Azure_openai_api
-from azure_search_client import call_Rag_api
-from resume_rag_ollama_oop import ResumeRAG
+import json
+import os
+import threading
+from flask import Flask, Response, render_template, url_for, request, jsonify, stream_with_context
+from config import load_env
+from call_Azure_endpoints import AzureOpenAIWrapper, call_Azure_openai_api, stream_Azure_openai_api
 
 
 app = Flask(__name__)
 
 # Load .env file if present so local OPENAI_API_KEY is available during development
-load_dotenv()
+load_env()
 
 # Initialize Ollama RAG system
 ollama_rag = None
+_ollama_lock = threading.Lock()
 
 def get_ollama_rag():
-    """Lazy initialization of Ollama RAG system."""
+    """Lazy, thread-safe initialization of Ollama RAG system."""
     global ollama_rag
     if ollama_rag is None:
-        ollama_rag = ResumeRAG(
-            pdf_path="C:/resume/resume.pdf",
-            chat_model="gpt-oss:20b",
-            embedding_model="nomic-embed-text"
-        )
-        ollama_rag.load_and_process_document()
-        ollama_rag.setup_qa_chain()
+        with _ollama_lock:
+            if ollama_rag is None:
+                # Imported on first use so the app can boot without the Ollama/langchain stack
+                from resume_rag_ollama_oop import ResumeRAG
+                rag = ResumeRAG(
+                    pdf_path="C:/resume/resume.pdf",
+                    chat_model="gpt-oss:20b",
+                    embedding_model="nomic-embed-text"
+                )
+                rag.load_and_process_document()
+                rag.setup_qa_chain()
+                ollama_rag = rag
     return ollama_rag
 
 
+def _warm_ollama_rag():
+    """Build the Ollama RAG system in the background so the first request doesn't pay for it."""
+    try:
+        get_ollama_rag()
+    except Exception as e:
+        app.logger.warning("Ollama RAG warm-up failed: %s", e)
+
+
+if os.environ.get("OLLAMA_RAG_WARMUP") == "1":
+    threading.Thread(target=_warm_ollama_rag, daemon=True).start()
+
+def _prewarm_connections():
+    """Open TLS connections and build the shared RAG client so the first requests skip setup."""
+    AzureOpenAIWrapper().prewarm()
+    try:
+        from azure_search_client import get_rag_client
+        get_rag_client()
+    except Exception as e:
+        app.logger.warning("Azure Search RAG warm-up failed: %s", e)
+
+
+if os.environ.get("PREWARM_CONNECTIONS") == "1":
+    threading.Thread(target=_prewarm_connections, daemon=True).start()
+
+
 PROFILE = {
     "name": "Quazi Heider",
     "title": "Software Engineer",
@@ -55,12 +87,28 @@ def ask():
     return render_template('ask.html', answer=answer) # only render ask.html on GET or after processing POST
 
 
+@app.route('/ask-stream', methods=['POST'])
+def ask_stream():
+    """Stream the answer to a question as server-sent events."""
+    question = request.form.get('question', '').strip()
+
+    def generate():
+        chunks = stream_Azure_openai_api(question) if question else ['Please enter a question.']
+        for chunk in chunks:
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+
 @app.route('/resume-ai', methods=['GET', 'POST'])
 def resume_ai():
     answer = None
     if request.method == 'POST':
         question = request.form.get('question', '').strip()
         if question:
+            # Imported on first use so the app can boot without the Azure Search SDK
+            from azure_search_client import call_Rag_api
             answer = call_Rag_api(question)
         else:
             answer = 'Please enter a question.'
@@ -68,6 +116,27 @@ def resume_ai():
     return render_template('resumeAi.html', answer=answer)
 
 
+@app.route('/resume-ai-stream', methods=['POST'])
+def resume_ai_stream():
+    """Stream the RAG answer to a question as server-sent events."""
+    question = request.form.get('question', '').strip()
+
+    def generate():
+        if not question:
+            chunks = ['Please enter a question.']
+        else:
+            from azure_search_client import stream_Rag_api
+            chunks = stream_Rag_api(question)
+        try:
+            for chunk in chunks:
+                yield f"data: {json.dumps(chunk)}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps(f'Error: {str(e)}')}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+
+
 @app.route('/resume-ai-ollama', methods=['GET', 'POST'])
 def resume_ai_ollama():
     answer = None
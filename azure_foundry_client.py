@@ -1,20 +1,81 @@
 """Azure Foundry Client for calling Azure OpenAI deployment endpoints."""
 
 import os
+import threading
+from concurrent.futures import Future
+from typing import Iterator, Union
+
+import httpx
+import orjson
 import requests
+from llm_cache import TTLCache, make_key
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def create_session(pool_connections: int = 20, pool_maxsize: int = 100) -> requests.Session:
+    """Create a requests session with a keep-alive connection pool and retries on transient errors."""
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        # Chat completions are POSTs, which urllib3 does not retry unless told to. Read errors are
+        # not retried: the server may already be generating (and billing) the completion.
+        max_retries=Retry(
+            total=2,
+            read=False,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        ),
+    ))
+    return session
+
+
+def iter_stream_content(resp) -> Iterator[str]:
+    """Yield assistant content deltas from a streamed (server-sent events) chat completion response."""
+    # Work on raw bytes: SSE responses often carry no charset, and requests would then decode
+    # them as ISO-8859-1; orjson parses the UTF-8 payload directly
+    for line in resp.iter_lines():
+        if not line.startswith(b"data:"):
+            continue
+        data = line[len(b"data:"):].strip()
+        if data == b"[DONE]":
+            break
+        for choice in orjson.loads(data).get("choices") or []:
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
 
 
 class AzureFoundryClient:
     """A small client to call Azure Foundry / Azure OpenAI deployment endpoints.
 
     It builds the deployments endpoint if provided a base URL and handles requests and basic parsing.
+    Requests go through a shared pooled session so TLS connections are reused across calls.
     """
 
+    _session = create_session()
+    _cache = TTLCache(maxsize=2048, ttl=1800)
+    # Identical requests already on the wire; later callers wait for the first one's result
+    _inflight = {}
+    _inflight_lock = threading.Lock()
+
     def __init__(self, endpoint: str = None, api_key: str = None, deployment: str = None, api_version: str = None):
         self.endpoint = endpoint or os.environ.get("AZURE_FOUNDRY_MODEL_ENDPOINT")
         self.api_key = api_key or os.environ.get("AZURE_FOUNDRY_MODEL_API_KEY")
         self.deployment = deployment or os.environ.get("AZURE_FOUNDRY_MODEL_DEPLOYMENT")
         self.api_version = api_version or os.environ.get("AZURE_FOUNDRY_MODEL_API_VERSION", "2025-01-01-preview")
+        self._async_client = None
+
+        # Resolve the request target once; configuration errors surface on first use
+        self._headers = {"api-key": self.api_key, "Content-Type": "application/json"}
+        try:
+            self._endpoint_url = self.build_endpoint()
+        except ValueError:
+            self._endpoint_url = None
 
     def build_endpoint(self) -> str:
         if not self.endpoint:
@@ -25,30 +86,127 @@ class AzureFoundryClient:
             raise ValueError("AZURE_FOUNDRY_MODEL_DEPLOYMENT is required when endpoint is a base URL")
         return self.endpoint.rstrip('/') + f"/openai/deployments/{self.deployment}/chat/completions?api-version={self.api_version}"
 
-    def call(self, prompt: str, max_tokens: int = 150, temperature: float = 0.7) -> str:
-        if not (self.endpoint and self.api_key):
-            raise ValueError("Azure endpoint or API key not configured")
-
-        endpoint = self.build_endpoint()
-        headers = {"api-key": self.api_key, "Content-Type": "application/json"}
-        payload = {
+    def _build_payload(self, prompt: str, max_tokens: int, temperature: float) -> dict:
+        return {
             "messages": [{"role": "user", "content": prompt}],
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
 
-        resp = requests.post(endpoint, headers=headers, json=payload, timeout=30)
-        if not resp.ok:
-            body = resp.text or ""
-            snippet = body[:500].replace('\n', ' ')
+    def _cache_key(self, endpoint: str, payload: dict) -> str:
+        return make_key(
+            m=endpoint,
+            msgs=payload["messages"],
+            t=payload["temperature"],
+            mt=payload["max_tokens"],
+        )
+
+    def _raise_for_error(self, resp) -> None:
+        if resp.status_code >= 400:
+            body = resp.content[:512]
+            snippet = body.decode("utf-8", "replace").replace('\n', ' ')
             raise RuntimeError(f"Azure Foundry request failed (status={resp.status_code}): {snippet}")
 
+    def _parse_response(self, resp) -> str:
+        """Extract assistant content from a requests or httpx response."""
+        self._raise_for_error(resp)
+
         try:
-            data = resp.json()
-        except Exception as e:
+            data = orjson.loads(resp.content)
+        except orjson.JSONDecodeError as e:
             raise RuntimeError("Azure Foundry returned non-JSON response") from e
 
         try:
-            return data.get("choices", [])[0].get("message", {}).get("content", "")
-        except Exception:
+            return data["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
             raise RuntimeError("Azure Foundry response did not contain assistant content")
+
+    def call(
+        self, prompt: str, max_tokens: int = 150, temperature: float = 0.7, stream: bool = False
+    ) -> Union[str, Iterator[str]]:
+        """Send a chat completion; with stream=True return an iterator of content deltas instead."""
+        if not (self.endpoint and self.api_key):
+            raise ValueError("Azure endpoint or API key not configured")
+
+        endpoint = self._endpoint_url or self.build_endpoint()
+        headers = self._headers
+        payload = self._build_payload(prompt, max_tokens, temperature)
+
+        key = self._cache_key(endpoint, payload)
+        if stream:
+            return self._stream(endpoint, headers, payload, key)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            resp = self._session.post(endpoint, headers=headers, data=orjson.dumps(payload), timeout=30)
+            content = self._parse_response(resp)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            self._cache.set(key, content)
+            future.set_result(content)
+            return content
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _stream(self, endpoint: str, headers: dict, payload: dict, key: str) -> Iterator[str]:
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        body = orjson.dumps({**payload, "stream": True})
+        with self._session.post(endpoint, headers=headers, data=body, timeout=30, stream=True) as resp:
+            self._raise_for_error(resp)
+            parts = []
+            for content in iter_stream_content(resp):
+                parts.append(content)
+                yield content
+        self._cache.set(key, "".join(parts))
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Lazily create the pooled async client (bound to the event loop that first uses it)."""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0),
+                timeout=30,
+            )
+        return self._async_client
+
+    async def acall(self, prompt: str, max_tokens: int = 150, temperature: float = 0.7) -> str:
+        """Async variant of `call` so many in-flight completions can share one event loop."""
+        if not (self.endpoint and self.api_key):
+            raise ValueError("Azure endpoint or API key not configured")
+
+        endpoint = self._endpoint_url or self.build_endpoint()
+        headers = self._headers
+        payload = self._build_payload(prompt, max_tokens, temperature)
+
+        key = self._cache_key(endpoint, payload)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        resp = await self._get_async_client().post(endpoint, headers=headers, content=orjson.dumps(payload))
+        content = self._parse_response(resp)
+        self._cache.set(key, content)
+        return content
+
+    async def aclose(self) -> None:
+        """Close the async connection pool, if one was created."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -1,13 +1,101 @@
 """Azure AI Search client with RAG (Retrieval-Augmented Generation) capabilities."""
 
-import os
-from pathlib import Path
-from typing import Dict, List, Optional
-from dotenv import load_dotenv
-from azure.core.credentials import AzureKeyCredential
-from azure.search.documents import SearchClient
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+from azure.core.credentials import AccessToken, AzureKeyCredential
+from azure.search.documents import SearchClient, SearchIndexingBufferedSender
 from azure.identity import DefaultAzureCredential, AzureCliCredential
-from openai import AzureOpenAI
+from config import clean_endpoint, clean_value, settings
+from llm_cache import SemanticCache, TTLCache, make_key
+from rate_limit import RateLimiter, request_cost
+from tokens import count_tokens, truncate_and_count
+
+if TYPE_CHECKING:
+    from openai import AzureOpenAI
+
+
+_SETTINGS = settings()
+
+# Search result fields checked, in order, for chunk text and source name
+CONTENT_KEYS = ("content", "chunk", "text")
+NAME_KEYS = ("source_file", "metadata_storage_name", "title")
+
+# Longest single search hit, in tokens, included in the prompt context
+MAX_CHUNK_TOKENS = 400
+
+# Kept verbatim and sent first so the server-side prompt cache can reuse the prefix
+SYSTEM_PROMPT = (
+    "You are an AI assistant who answers questions **only** using the information "
+    "contained in the provided context snippets.\n\n"
+    "Rules you must follow:\n"
+    "- Use **only** the provided context to generate answers.\n"
+    "- Do not rely on prior knowledge, assumptions, or external sources.\n"
+    "- If the answer cannot be found in the provided context, clearly state:\n"
+    "  \"The information is not available in the provided sources.\"\n\n"
+    "Citation requirements:\n"
+    "- Every factual statement must be supported by a citation.\n"
+    "- Cite sources using the format [Source N], where N corresponds to the number "
+    "preceding the source content.\n"
+    "- Place citations at the end of the sentence they support.\n\n"
+    "Formatting guidelines:\n"
+    "- Use Markdown format for all responses.\n"
+    "- Structure answers clearly using paragraphs or bullet points when appropriate.\n"
+    "- Do not include citations in headings or titles."
+)
+
+# Exact-match cache of RAG answers keyed by the question text
+_ANSWER_CACHE = TTLCache(maxsize=2048, ttl=1800)
+
+# Client-side limits for Azure OpenAI chat calls, shared by all clients
+_RATE_LIMITER = RateLimiter(
+    requests_per_minute=_SETTINGS.azure_openai_rpm,
+    tokens_per_minute=_SETTINGS.azure_openai_tpm
+)
+
+# Azure Search results keyed by normalized query, index and top
+_SEARCH_CACHE = TTLCache(maxsize=512, ttl=1800)
+
+# Semantic cache of RAG answers keyed by question embedding, shared by all clients.
+# A hit also requires the retrieved documents to overlap the cached ones by this Jaccard score.
+_SEMANTIC_CACHE = SemanticCache(threshold=0.93)
+MIN_GROUNDING_OVERLAP = 0.8
+
+
+class CachingTokenCredential:
+    """Token credential wrapper that reuses an access token until shortly before it expires.
+
+    AzureCliCredential spawns an `az` subprocess for every token request, so caching the
+    token in memory takes that cost off the search path.
+    """
+
+    def __init__(self, inner, refresh_margin: int = 300):
+        """
+        Wrap a credential.
+        
+        Args:
+            inner: Credential that actually acquires tokens
+            refresh_margin: Seconds before expiry at which a new token is fetched
+        """
+        self._inner = inner
+        self._refresh_margin = refresh_margin
+        self._cached: Dict[tuple, AccessToken] = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes: str, **kwargs) -> AccessToken:
+        """Return a cached token for the scopes, fetching a new one when it is near expiry."""
+        if kwargs.get("claims"):
+            return self._inner.get_token(*scopes, **kwargs)
+
+        key = (scopes, kwargs.get("tenant_id"), kwargs.get("enable_cae", False))
+        with self._lock:
+            token = self._cached.get(key)
+            if token is None or time.time() >= token.expires_on - self._refresh_margin:
+                token = self._inner.get_token(*scopes, **kwargs)
+                self._cached[key] = token
+            return token
 
 
 class AzureSearchRAGClient:
@@ -20,7 +108,10 @@ class AzureSearchRAGClient:
         search_api_key: Optional[str] = None,
         openai_endpoint: Optional[str] = None,
         openai_api_key: Optional[str] = None,
-        openai_deployment: Optional[str] = None
+        openai_deployment: Optional[str] = None,
+        embedding_deployment: Optional[str] = None,
+        context_token_budget: int = 6000,
+        max_answer_tokens: int = 256
     ):
         """
         Initialize Azure Search RAG Client.
@@ -32,43 +123,29 @@ class AzureSearchRAGClient:
             openai_endpoint: Azure OpenAI endpoint
             openai_api_key: Azure OpenAI API key
             openai_deployment: OpenAI deployment/model name
+            embedding_deployment: Embedding deployment used for the semantic answer cache
+                (the cache is disabled when not configured)
+            context_token_budget: Maximum tokens of retrieved context sent to the model
+            max_answer_tokens: Maximum tokens the model may generate per answer
         """
-        # Load environment variables
-        env_path = Path(__file__).parent / '.env'
-        load_dotenv(dotenv_path=env_path)
-        
         # Initialize search configuration
-        self.search_endpoint = self._validate_endpoint(
-            search_endpoint or os.getenv("AZURE_SEARCH_SERVICE_ENDPOINT", "")
-        )
-        self.search_index = (search_index or os.getenv("AZURE_SEARCH_INDEX_NAME", "")).strip('"\'')
-        self.search_api_key = (search_api_key or os.getenv("AZURE_SEARCH_API_KEY", "")).strip('"\'')
+        self.search_endpoint = clean_endpoint(search_endpoint or _SETTINGS.search_endpoint)
+        self.search_index = clean_value(search_index or _SETTINGS.search_index)
+        self.search_api_key = clean_value(search_api_key or _SETTINGS.search_api_key)
         
         # Initialize OpenAI configuration
-        self.openai_endpoint = self._validate_endpoint(
-            openai_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT", "")
-        )
-        self.openai_api_key = (openai_api_key or os.getenv("AZURE_OPENAI_API_KEY", "")).strip('"\'')
-        self.openai_deployment = (openai_deployment or os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4.1-nano")).strip('"\'')
+        self.openai_endpoint = clean_endpoint(openai_endpoint or _SETTINGS.openai_endpoint)
+        self.openai_api_key = clean_value(openai_api_key or _SETTINGS.openai_api_key)
+        self.openai_deployment = clean_value(openai_deployment or _SETTINGS.openai_deployment)
+        self.embedding_deployment = clean_value(embedding_deployment or _SETTINGS.embedding_deployment)
+        self.context_token_budget = context_token_budget
+        self.max_answer_tokens = max_answer_tokens
         
         # Initialize clients
         self.search_client = self._create_search_client()
         self.openai_client = self._create_openai_client()
-
-    def _validate_endpoint(self, endpoint: str) -> str:
-        """Validate and fix endpoint URL to ensure HTTPS."""
-        endpoint = endpoint.strip('"\'')
-        
-        if not endpoint or endpoint.startswith('PUT-YOUR'):
-            return endpoint
-            
-        if not endpoint.startswith('https://'):
-            if endpoint.startswith('http://'):
-                endpoint = endpoint.replace('http://', 'https://', 1)
-            else:
-                endpoint = 'https://' + endpoint
-        
-        return endpoint
+        self._sem_cache = _SEMANTIC_CACHE
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag")
 
     def _create_search_client(self) -> SearchClient:
         """Create and authenticate Azure Search client."""
@@ -78,6 +155,7 @@ class AzureSearchRAGClient:
         # Try API Key first
         if self.search_api_key and not self.search_api_key.startswith('PUT-YOUR'):
             credential = AzureKeyCredential(self.search_api_key)
+            self._search_credential = credential
             return SearchClient(
                 endpoint=self.search_endpoint,
                 index_name=self.search_index,
@@ -86,7 +164,8 @@ class AzureSearchRAGClient:
         
         # Fallback to Azure CLI
         try:
-            credential = AzureCliCredential()
+            credential = CachingTokenCredential(AzureCliCredential())
+            self._search_credential = credential
             return SearchClient(
                 endpoint=self.search_endpoint,
                 index_name=self.search_index,
@@ -94,15 +173,21 @@ class AzureSearchRAGClient:
             )
         except Exception:
             # Last resort: DefaultAzureCredential
-            credential = DefaultAzureCredential(exclude_shared_token_cache_credential=True)
+            credential = CachingTokenCredential(
+                DefaultAzureCredential(exclude_shared_token_cache_credential=True)
+            )
+            self._search_credential = credential
             return SearchClient(
                 endpoint=self.search_endpoint,
                 index_name=self.search_index,
                 credential=credential
             )
 
-    def _create_openai_client(self) -> AzureOpenAI:
+    def _create_openai_client(self) -> "AzureOpenAI":
         """Create Azure OpenAI client."""
+        # Deferred so importing this module doesn't pay for the openai package
+        from openai import AzureOpenAI
+
         if not self.openai_endpoint or not self.openai_api_key:
             raise ValueError("OpenAI endpoint and API key are required")
         
@@ -123,91 +208,268 @@ class AzureSearchRAGClient:
         Returns:
             List of search results
         """
+        key = make_key(q=query.lower().strip(), index=self.search_index, top=top)
+        cached = _SEARCH_CACHE.get(key)
+        if cached is not None:
+            return cached
+
         search_results = self.search_client.search(search_text=query, top=top)
-        return [result for result in search_results]
+        results = [result for result in search_results]
+        _SEARCH_CACHE.set(key, results)
+        return results
 
-    def generate_answer(self, query: str, top: int = 3) -> str:
+    def _embed_for_cache(self, query: str) -> Optional[List[float]]:
         """
-        Generate grounded AI answer using RAG (Retrieval-Augmented Generation).
-        
+        Embed a query for the semantic answer cache.
+
         Args:
             query: User question
-            top: Number of search results to use as context
-            
+
         Returns:
-            Dictionary with 'answer' and 'citations' keys
+            Embedding vector, or None if no embedding deployment is configured or the call fails
         """
-        # 1. RETRIEVE: Search for relevant documents
-        search_results = self.search(query, top)
+        if not self.embedding_deployment:
+            return None
+        try:
+            return self.embed_batch([query])[0]
+        except Exception:
+            return None
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts with a single embeddings request.
         
-        # 2. AUGMENT: Build context from search results
-        context_chunks = []
-        citations = []
-        
-        for i, result in enumerate(search_results):
-            # Extract content from available fields
-            chunk_content = (
-                result.get('content') or 
-                result.get('chunk') or 
-                result.get('text') or 
-                str(result)
-            )
-            source_name = (
-                result.get('source_file') or 
-                result.get('metadata_storage_name') or 
-                result.get('title') or 
-                f"Source {i+1}"
-            )
+        Args:
+            texts: Texts to embed
             
-            context_chunks.append(f"Source [{i+1}]: {chunk_content}")
-            citations.append(f"[{i+1}] {source_name}")
-        
-        context = "\n\n".join(context_chunks)
+        Returns:
+            One embedding vector per text, in input order
+        """
+        response = self.openai_client.embeddings.create(model=self.embedding_deployment, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def _fit_to_budget(self, hits: List) -> List:
+        """Keep the highest-ranked (source, content, tokens) hits that fit within the context token budget."""
+        kept = []
+        used = 0
+        for hit in hits:
+            used += hit[2]
+            if used > self.context_token_budget:
+                break
+            kept.append(hit)
+        return kept
+
+    def _prepare(self, query: str, top: int, query_embedding: Optional[List[float]] = None):
+        """
+        Retrieve context for a question and check the semantic answer cache.
         
-        # 3. GENERATE: Get AI response grounded in context
-        # system_prompt = (
-        #     "You are an AI assistant who answers questions based **ONLY** on the "
-        #     "provided context snippets. If the answer cannot be found in the context, "
-        #     "state clearly that the information is not available in the provided sources. "
-        #     "Cite your sources using the format [Source N] at the end of the sentence "
-        #     "where N is the number preceding the source content."
-        # )
-
-        system_prompt = (
-    "You are an AI assistant who answers questions **only** using the information "
-    "contained in the provided context snippets.\n\n"
-    "Rules you must follow:\n"
-    "- Use **only** the provided context to generate answers.\n"
-    "- Do not rely on prior knowledge, assumptions, or external sources.\n"
-    "- If the answer cannot be found in the provided context, clearly state:\n"
-    "  \"The information is not available in the provided sources.\"\n\n"
-    "Citation requirements:\n"
-    "- Every factual statement must be supported by a citation.\n"
-    "- Cite sources using the format [Source N], where N corresponds to the number "
-    "preceding the source content.\n"
-    "- Place citations at the end of the sentence they support.\n\n"
-    "Formatting guidelines:\n"
-    "- Use Markdown format for all responses.\n"
-    "- Structure answers clearly using paragraphs or bullet points when appropriate.\n"
-    "- Do not include citations in headings or titles."
-)
+        Args:
+            query: User question
+            top: Number of search results to use as context
+            query_embedding: Precomputed cache embedding of the question (embedded here if None)
+            
+        Returns:
+            Tuple of (cached answer or None, chat messages, semantic cache entry for the answer)
+        """
+        # 1. RETRIEVE: Search for relevant documents, overlapped with the cache embedding
+        search_future = self._executor.submit(self.search, query, top)
+        if query_embedding is None:
+            query_embedding = self._embed_for_cache(query)
+        search_results = search_future.result()
+        retrieved = frozenset(_first_field(result, CONTENT_KEYS) or "" for result in search_results)
+
+        # 0. CACHE: Reuse the answer to a semantically equivalent earlier question, but only
+        # if it was grounded in (nearly) the same retrieved documents
+        if query_embedding is not None:
+            cached = self._sem_cache.get(query_embedding)
+            if cached is not None:
+                cached_retrieved, cached_result = cached
+                if _jaccard(retrieved, cached_retrieved) >= MIN_GROUNDING_OVERLAP:
+                    return cached_result, None, None
 
+        # 2. AUGMENT: Build context from search results
+        hits = self._fit_to_budget([_extract(i, result) for i, result in enumerate(search_results, 1)])
+        # Order sources deterministically so the same documents always give the same prompt prefix
+        hits.sort()
+        context = "\n\n".join(f"Source [{n}]: {content}" for n, (_, content, _) in enumerate(hits, 1))
         
         user_prompt = f"Context: {context}\n\nQuestion: {query}"
+        # Chunk sizes were counted while trimming them; only the question is tokenized here
+        prompt_tokens = _system_prompt_tokens() + sum(tokens for _, _, tokens in hits) + count_tokens(query)
+        _RATE_LIMITER.acquire(request_cost(prompt_tokens, self.max_answer_tokens))
+        messages = [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ]
+        return None, messages, (query_embedding, retrieved)
+
+    def _remember(self, cache_entry, result: Dict) -> None:
+        """Store a generated answer in the semantic cache."""
+        query_embedding, retrieved = cache_entry
+        if query_embedding is not None:
+            self._sem_cache.set(query_embedding, (retrieved, result))
+
+    def generate_answer(self, query: str, top: int = 3, query_embedding: Optional[List[float]] = None) -> str:
+        """
+        Generate grounded AI answer using RAG (Retrieval-Augmented Generation).
         
+        Args:
+            query: User question
+            top: Number of search results to use as context
+            query_embedding: Precomputed cache embedding of the question (embedded here if None)
+            
+        Returns:
+            Dictionary with 'answer' and 'citations' keys
+        """
+        cached, messages, cache_entry = self._prepare(query, top, query_embedding)
+        if cached is not None:
+            return cached
+
+        # 3. GENERATE: Get AI response grounded in context
         response = self.openai_client.chat.completions.create(
             model=self.openai_deployment,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.0
+            messages=messages,
+            temperature=0.0,
+            max_tokens=self.max_answer_tokens
         )
         
-        return {
+        result = {
             "answer": response.choices[0].message.content,
-            # "citations": citations
         }
+        self._remember(cache_entry, result)
+        return result
+
+    def stream_answer(self, query: str, top: int = 3) -> Iterator[str]:
+        """
+        Generate a grounded AI answer, yielding it piece by piece as the model produces it.
+        
+        Args:
+            query: User question
+            top: Number of search results to use as context
+            
+        Yields:
+            Pieces of the answer text
+        """
+        cached, messages, cache_entry = self._prepare(query, top)
+        if cached is not None:
+            yield cached["answer"]
+            return
+
+        stream = self.openai_client.chat.completions.create(
+            model=self.openai_deployment,
+            messages=messages,
+            temperature=0.0,
+            max_tokens=self.max_answer_tokens,
+            stream=True
+        )
+        parts = []
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+        self._remember(cache_entry, {"answer": "".join(parts)})
+
+    def upload_documents(self, documents: List[Dict], key_field: str = "id") -> None:
+        """
+        Upload documents to the search index in adaptive, retried batches.
+        
+        SearchIndexingBufferedSender batches, parallelizes and backs off on throttling,
+        avoiding the 503s a per-document upload loop runs into.
+        
+        Args:
+            documents: Documents matching the index schema
+            key_field: Name of the index key field, used to report failed documents
+            
+        Raises:
+            RuntimeError: If any document still failed after the sender's retries
+        """
+        failed = []
+        with SearchIndexingBufferedSender(
+            endpoint=self.search_endpoint,
+            index_name=self.search_index,
+            credential=self._search_credential,
+            auto_flush_interval=60,
+            initial_batch_action_count=1000,
+            on_error=lambda action: failed.append(action.additional_properties.get(key_field))
+        ) as sender:
+            sender.upload_documents(documents=documents)
+
+        if failed:
+            raise RuntimeError(f"Failed to index {len(failed)} document(s): {failed}")
+
+    def batch_answer(self, queries: List[str], top: int = 3, max_concurrency: int = 5) -> List[Dict]:
+        """
+        Answer several questions concurrently.
+        
+        The cache embeddings for all questions are fetched with one embeddings request up front.
+        
+        Args:
+            queries: User questions
+            top: Number of search results to use as context
+            max_concurrency: Maximum questions in flight at once (keeps clear of 429s)
+            
+        Returns:
+            One answer dictionary per question, in input order
+        """
+        embeddings = [None] * len(queries)
+        if self.embedding_deployment and queries:
+            try:
+                embeddings = self.embed_batch(queries)
+            except Exception:
+                pass
+
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="rag-batch") as pool:
+            return list(pool.map(lambda query, embedding: self.generate_answer(query, top, embedding), queries, embeddings))
+
+
+def _first_field(result: Dict, keys) -> Optional[str]:
+    """Return the first non-empty value among keys in a search result."""
+    for key in keys:
+        value = result.get(key)
+        if value:
+            return value
+    return None
+
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    """Jaccard similarity of two sets (1.0 when both are empty)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _extract(n: int, result: Dict):
+    """Return the source name, trimmed content and content token count of the n-th (1-based) search result."""
+    chunk_content, chunk_tokens = truncate_and_count((_first_field(result, CONTENT_KEYS) or "").strip(), MAX_CHUNK_TOKENS)
+    source_name = _first_field(result, NAME_KEYS) or f"Source {n}"
+    return source_name, chunk_content, chunk_tokens
+
+
+@functools.lru_cache(maxsize=1)
+def _system_prompt_tokens() -> int:
+    """Token count of the constant SYSTEM_PROMPT, computed on first use rather than at import."""
+    return count_tokens(SYSTEM_PROMPT)
+
+
+# Shared client for call_Rag_api so connections and credentials are reused across requests
+_SINGLETON: Optional[AzureSearchRAGClient] = None
+_LOCK = threading.Lock()
+
+
+def get_rag_client() -> AzureSearchRAGClient:
+    """
+    Return the process-wide RAG client, creating it on first use.
+    
+    Returns:
+        The shared AzureSearchRAGClient
+    """
+    global _SINGLETON
+    if _SINGLETON is None:
+        with _LOCK:
+            if _SINGLETON is None:
+                _SINGLETON = AzureSearchRAGClient()
+    return _SINGLETON
+
 
 def call_Rag_api(prompt: str) -> str:
     """
@@ -219,8 +481,35 @@ def call_Rag_api(prompt: str) -> str:
     Returns:
         The response from the API
     """
-    wrapper = AzureSearchRAGClient()
-    return wrapper.generate_answer(prompt)
+    key = make_key(q=prompt)
+    cached = _ANSWER_CACHE.get(key)
+    if cached is not None:
+        return cached
 
+    answer = get_rag_client().generate_answer(prompt)
+    _ANSWER_CACHE.set(key, answer)
+    return answer
 
 
+def stream_Rag_api(prompt: str) -> Iterator[str]:
+    """
+    Streaming counterpart of call_Rag_api.
+    
+    Args:
+        prompt: The prompt to send to the model
+        
+    Yields:
+        Pieces of the answer text
+    """
+    key = make_key(q=prompt)
+    cached = _ANSWER_CACHE.get(key)
+    if cached is not None:
+        yield cached["answer"]
+        return
+
+    parts = []
+    for piece in get_rag_client().stream_answer(prompt):
+        parts.append(piece)
+        yield piece
+    # Only a stream that ran to completion is cached, in the same shape call_Rag_api stores
+    _ANSWER_CACHE.set(key, {"answer": "".join(parts)})
@@ -1,8 +1,40 @@
 """Azure and OpenAI API client wrapper."""
 
+import functools
+import importlib.util
 import os
-import requests
-from azure_foundry_client import AzureFoundryClient
+from typing import Iterator, Optional
+
+import httpx
+import orjson
+from azure_foundry_client import AzureFoundryClient, create_session, iter_stream_content
+from config import settings
+from rate_limit import RateLimiter, request_cost
+from tokens import count_tokens
+
+
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
+
+# Shared keep-alive pool for api.openai.com calls
+_SESSION = create_session(pool_connections=10, pool_maxsize=10)
+
+# HTTP/2 needs the optional h2 package (httpx[http2])
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Client-side limits for OpenAI chat calls (settings() loads .env first)
+_RATE_LIMITER = RateLimiter(
+    requests_per_minute=settings().openai_rpm,
+    tokens_per_minute=settings().openai_tpm,
+)
+
+# Generation settings shared by every OpenAI request
+_PAYLOAD_TEMPLATE = {"max_tokens": 150, "temperature": 0.7}
+
+
+@functools.lru_cache(maxsize=8)
+def _foundry_client(endpoint: str, api_key: str) -> AzureFoundryClient:
+    """Return the shared Azure Foundry client for an endpoint and key, so its URL and headers are resolved once."""
+    return AzureFoundryClient(endpoint=endpoint, api_key=api_key)
 
 
 class AzureOpenAIWrapper:
@@ -31,7 +63,7 @@ class AzureOpenAIWrapper:
         Raises:
             Exception: If the API call fails
         """
-        client = AzureFoundryClient(endpoint=self.azure_endpoint, api_key=self.azure_key)
+        client = _foundry_client(self.azure_endpoint, self.azure_key)
         return client.call(prompt)
 
     def call_openai(self, prompt: str, model: str = "gpt-3.5-turbo") -> str:
@@ -49,22 +81,39 @@ class AzureOpenAIWrapper:
             Exception: If the API call fails
         """
         headers = {"Authorization": f"Bearer {self.openai_key}", "Content-Type": "application/json"}
-        payload = {
-            "model": model,
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 150,
-            "temperature": 0.7,
-        }
-
-        resp = requests.post(
-            "https://api.openai.com/v1/chat/completions",
+        payload = {"model": model, "messages": [{"role": "user", "content": prompt}], **_PAYLOAD_TEMPLATE}
+        _RATE_LIMITER.acquire(request_cost(count_tokens(prompt), _PAYLOAD_TEMPLATE["max_tokens"]))
+
+        resp = _SESSION.post(
+            OPENAI_CHAT_URL,
             headers=headers,
-            json=payload,
+            data=orjson.dumps(payload),
             timeout=10,
         )
         resp.raise_for_status()
-        data = resp.json()
-        return data.get("choices", [])[0].get("message", {}).get("content", "")
+        return _parse_openai_content(resp.content)
+
+    def stream_openai(self, prompt: str, model: str = "gpt-3.5-turbo") -> Iterator[str]:
+        """
+        Call OpenAI public API with a streamed response.
+        
+        Args:
+            prompt: The prompt to send to the model
+            model: The OpenAI model to use
+            
+        Yields:
+            Pieces of the response as they arrive
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        headers = {"Authorization": f"Bearer {self.openai_key}", "Content-Type": "application/json"}
+        payload = {"model": model, "messages": [{"role": "user", "content": prompt}], "stream": True, **_PAYLOAD_TEMPLATE}
+        _RATE_LIMITER.acquire(request_cost(count_tokens(prompt), _PAYLOAD_TEMPLATE["max_tokens"]))
+
+        with _SESSION.post(OPENAI_CHAT_URL, headers=headers, data=orjson.dumps(payload), timeout=10, stream=True) as resp:
+            resp.raise_for_status()
+            yield from iter_stream_content(resp)
 
     def call(self, prompt: str) -> str:
         """
@@ -96,6 +145,138 @@ class AzureOpenAIWrapper:
 
         return "No AI API key configured. Set OPENAI_API_KEY or AZURE_FOUNDRY_MODEL_API_KEY in environment to get an AI response."
 
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream the response from the appropriate API chunk by chunk.
+        
+        Args:
+            prompt: The prompt to send to the model
+            
+        Yields:
+            Pieces of the response text or a single error message
+        """
+        if not self.is_configured():
+            yield "No AI API key configured. Set OPENAI_API_KEY or AZURE_FOUNDRY_MODEL_API_KEY in environment to get an AI response."
+            return
+
+        if self.azure_endpoint and self.azure_key:
+            try:
+                client = _foundry_client(self.azure_endpoint, self.azure_key)
+                yield from client.call(prompt, stream=True)
+            except Exception as e:
+                yield f"Failed to fetch response from Azure Foundry model: {str(e)}"
+            return
+
+        try:
+            yield from self.stream_openai(prompt)
+        except Exception:
+            yield "Failed to fetch response from OpenAI."
+
+    def prewarm(self) -> None:
+        """
+        Open pooled TLS connections to the configured endpoints ahead of the first request.
+        Any HTTP status is fine here; only the connection matters, so errors are ignored.
+        """
+        targets = []
+        if self.azure_endpoint and self.azure_key:
+            client = _foundry_client(self.azure_endpoint, self.azure_key)
+            try:
+                targets.append((client._session, client.build_endpoint().split('?')[0]))
+            except ValueError:
+                pass
+        if self.openai_key:
+            targets.append((_SESSION, "https://api.openai.com/"))
+
+        for session, url in targets:
+            try:
+                session.head(url, timeout=2)
+            except Exception:
+                pass
+
+
+class AsyncAzureOpenAIWrapper:
+    """Async counterpart of AzureOpenAIWrapper whose calls can be gathered concurrently.
+
+    Configuration comes from a composed AzureOpenAIWrapper rather than subclassing it, so none
+    of the sync wrapper's blocking methods are exposed on this async object.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Initialize the wrapper and its pooled async HTTP client for OpenAI.
+        
+        Args:
+            transport: Optional httpx transport for OpenAI requests (e.g. a mock transport in tests)
+        """
+        self._config = AzureOpenAIWrapper()
+        self._client = httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=120,
+            headers={"Authorization": f"Bearer {self._config.openai_key}", "Content-Type": "application/json"},
+            transport=transport,
+        )
+        self._foundry = AzureFoundryClient(endpoint=self._config.azure_endpoint, api_key=self._config.azure_key)
+
+    async def call_openai(self, prompt: str, model: str = "gpt-3.5-turbo") -> str:
+        """
+        Call OpenAI public API.
+        
+        Args:
+            prompt: The prompt to send to the model
+            model: The OpenAI model to use
+            
+        Returns:
+            The response from OpenAI
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        payload = {"model": model, "messages": [{"role": "user", "content": prompt}], **_PAYLOAD_TEMPLATE}
+        await _RATE_LIMITER.aacquire(request_cost(count_tokens(prompt), _PAYLOAD_TEMPLATE["max_tokens"]))
+        resp = await self._client.post(OPENAI_CHAT_URL, content=orjson.dumps(payload))
+        resp.raise_for_status()
+        return _parse_openai_content(resp.content)
+
+    async def call(self, prompt: str) -> str:
+        """
+        Call the appropriate API based on available configuration.
+        Prefers Azure Foundry over OpenAI if both are configured.
+        
+        Args:
+            prompt: The prompt to send to the model
+            
+        Returns:
+            The response from the API or an error message
+        """
+        config = self._config
+        if not config.is_configured():
+            return "No AI API key configured. Set OPENAI_API_KEY or AZURE_FOUNDRY_MODEL_API_KEY in environment to get an AI response."
+
+        if config.azure_endpoint and config.azure_key:
+            try:
+                return await self._foundry.acall(prompt)
+            except Exception as e:
+                return f"Failed to fetch response from Azure Foundry model: {str(e)}"
+
+        try:
+            return await self.call_openai(prompt)
+        except Exception:
+            return "Failed to fetch response from OpenAI."
+
+    async def aclose(self) -> None:
+        """Close the pooled async HTTP clients."""
+        await self._client.aclose()
+        await self._foundry.aclose()
+
+
+def _parse_openai_content(body: bytes) -> str:
+    """Extract assistant content from a chat completion response body."""
+    data = orjson.loads(body)
+    try:
+        return data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError):
+        raise RuntimeError("OpenAI response did not contain assistant content")
+
 
 def call_Azure_openai_api(prompt: str) -> str:
     """
@@ -109,3 +290,17 @@ def call_Azure_openai_api(prompt: str) -> str:
     """
     wrapper = AzureOpenAIWrapper()
     return wrapper.call(prompt)
+
+
+def stream_Azure_openai_api(prompt: str) -> Iterator[str]:
+    """
+    Streaming counterpart of call_Azure_openai_api.
+    
+    Args:
+        prompt: The prompt to send to the model
+        
+    Returns:
+        An iterator over pieces of the response
+    """
+    wrapper = AzureOpenAIWrapper()
+    return wrapper.stream(prompt)
@@ -0,0 +1,92 @@
+"""Process-wide settings read once from the environment and the local .env file."""
+
+import functools
+import os
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+
+def clean_value(value: str) -> str:
+    """Strip the surrounding quotes .env files often leave around values."""
+    return value.strip('"\'')
+
+
+def clean_endpoint(endpoint: str) -> str:
+    """
+    Strip quotes from an endpoint and make sure it uses HTTPS.
+
+    Args:
+        endpoint: Raw endpoint value
+
+    Returns:
+        The endpoint with an https:// scheme, or unchanged if empty or a placeholder
+    """
+    endpoint = clean_value(endpoint)
+
+    if not endpoint or endpoint.startswith('PUT-YOUR'):
+        return endpoint
+
+    if not endpoint.startswith('https://'):
+        if endpoint.startswith('http://'):
+            endpoint = endpoint.replace('http://', 'https://', 1)
+        else:
+            endpoint = 'https://' + endpoint
+
+    return endpoint
+
+
+def _int_env(name: str, default: int) -> int:
+    """Read an integer setting, falling back to the default (with a warning) if it is malformed."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(clean_value(value))
+    except ValueError:
+        warnings.warn(f"Ignoring non-integer {name}={value!r}; using {default}")
+        return default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Azure Search, Azure OpenAI and OpenAI settings shared by the app's clients."""
+
+    search_endpoint: str
+    search_index: str
+    search_api_key: str
+    openai_endpoint: str
+    openai_api_key: str
+    openai_deployment: str
+    embedding_deployment: str
+    azure_openai_rpm: int
+    azure_openai_tpm: int
+    openai_rpm: int
+    openai_tpm: int
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> None:
+    """Load the .env file next to this module once per process."""
+    load_dotenv(dotenv_path=Path(__file__).parent / '.env')
+
+
+@functools.lru_cache(maxsize=1)
+def settings() -> Settings:
+    """Return the process-wide settings, parsing the environment on first use."""
+    load_env()
+    return Settings(
+        search_endpoint=clean_endpoint(os.getenv("AZURE_SEARCH_SERVICE_ENDPOINT", "")),
+        search_index=clean_value(os.getenv("AZURE_SEARCH_INDEX_NAME", "")),
+        search_api_key=clean_value(os.getenv("AZURE_SEARCH_API_KEY", "")),
+        openai_endpoint=clean_endpoint(os.getenv("AZURE_OPENAI_ENDPOINT", "")),
+        openai_api_key=clean_value(os.getenv("AZURE_OPENAI_API_KEY", "")),
+        openai_deployment=clean_value(os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4.1-nano")),
+        embedding_deployment=clean_value(os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT", "")),
+        azure_openai_rpm=_int_env("AZURE_OPENAI_RPM", 200),
+        azure_openai_tpm=_int_env("AZURE_OPENAI_TPM", 40000),
+        openai_rpm=_int_env("OPENAI_RPM", 200),
+        openai_tpm=_int_env("OPENAI_TPM", 40000),
+    )
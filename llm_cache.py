@@ -0,0 +1,130 @@
+"""In-process response caches for LLM calls."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+
+def make_key(**parts: Any) -> str:
+    """
+    Build a stable cache key from the parts of an LLM request.
+
+    Args:
+        **parts: Request fields (model, messages, temperature, max_tokens, ...)
+
+    Returns:
+        Hex SHA-256 digest of the JSON-encoded parts
+    """
+    encoded = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a fixed time-to-live."""
+
+    def __init__(self, maxsize: int = 2048, ttl: float = 1800):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before least-recently-used eviction
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the oldest entry when full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SemanticCache:
+    """Thread-safe nearest-neighbour cache keyed by embedding cosine similarity."""
+
+    def __init__(self, threshold: float = 0.9, maxsize: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a lookup to count as a hit
+            maxsize: Maximum number of entries before the oldest is evicted
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self._vectors = []
+        self._values = []
+        self._matrix = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, embedding) -> Optional[Any]:
+        """Return the value of the most similar entry, or None if nothing clears the threshold."""
+        query = self._normalize(embedding)
+        with self._lock:
+            if not self._vectors:
+                return None
+            if self._matrix is None:
+                self._matrix = np.stack(self._vectors)
+            scores = self._matrix @ query
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            return self._values[best]
+
+    def set(self, embedding, value: Any) -> None:
+        """Store value under the given embedding, evicting the oldest entry when full."""
+        vector = self._normalize(embedding)
+        with self._lock:
+            self._vectors.append(vector)
+            self._values.append(value)
+            if len(self._vectors) > self.maxsize:
+                del self._vectors[0]
+                del self._values[0]
+            self._matrix = None
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._vectors.clear()
+            self._values.clear()
+            self._matrix = None
+
+    def __len__(self) -> int:
+        return len(self._vectors)
@@ -0,0 +1,93 @@
+"""Preemptive client-side rate limiting for LLM APIs."""
+
+import asyncio
+import threading
+import time
+
+
+def request_cost(prompt_tokens: int, max_tokens: int) -> int:
+    """
+    Tokens a chat completion counts against the per-minute budget.
+
+    Azure OpenAI and OpenAI both charge the generation cap against TPM up front, so the
+    estimate is the prompt plus max_tokens rather than the prompt alone.
+
+    Args:
+        prompt_tokens: Tokens in the prompt messages
+        max_tokens: Maximum tokens the request may generate
+
+    Returns:
+        Estimated tokens to deduct before sending the request
+    """
+    return prompt_tokens + max_tokens
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting both requests and tokens per minute.
+
+    Callers deduct their estimated token cost before sending a request, so bursts are smoothed
+    out client-side instead of being rejected by the server with 429s.
+    """
+
+    def __init__(self, requests_per_minute: int = 200, tokens_per_minute: int = 40000):
+        """
+        Initialize the limiter with full buckets.
+
+        Args:
+            requests_per_minute: Request budget refilled every minute
+            tokens_per_minute: Token budget refilled every minute
+        """
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    def _try_acquire(self, tokens: int) -> float:
+        """Deduct one request and tokens if available; otherwise return how long to wait."""
+        with self._lock:
+            self._refill()
+            if self._requests >= 1 and self._tokens >= tokens:
+                self._requests -= 1
+                self._tokens -= tokens
+                return 0
+            return max(
+                (1 - self._requests) * 60 / self.requests_per_minute,
+                (tokens - self._tokens) * 60 / self.tokens_per_minute,
+            )
+
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Block until one request and the given number of tokens are available, then deduct them.
+
+        Args:
+            tokens: Estimated tokens the request will consume (capped at the per-minute budget)
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            wait = self._try_acquire(tokens)
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """
+        Async counterpart of acquire that waits without blocking the event loop.
+
+        Args:
+            tokens: Estimated tokens the request will consume (capped at the per-minute budget)
+        """
+        tokens = min(tokens, self.tokens_per_minute)
+        while True:
+            wait = self._try_acquire(tokens)
+            if not wait:
+                return
+            await asyncio.sleep(wait)
@@ -1,14 +1,15 @@
 """Resume RAG System using Ollama with OOP design."""
 
+import hashlib
 import os
-from typing import Optional, Dict, Any
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
-from langchain_ollama import OllamaEmbeddings, ChatOllama
-from langchain_classic.chains import RetrievalQA
-from langchain_core.prompts import PromptTemplate
+import uuid
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 
+# langchain, FAISS and the Ollama client are imported inside the methods that use them,
+# so importing this module (or starting interactive mode) stays cheap until first use.
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import FAISS
+    from langchain_core.documents import Document
 
 class ResumeRAG:
     """RAG system for querying resume documents using Ollama models."""
@@ -21,7 +22,8 @@ class ResumeRAG:
         embedding_model: str = "nomic-embed-text",
         chunk_size: int = 500,
         chunk_overlap: int = 50,
-        temperature: float = 0.0
+        temperature: float = 0.0,
+        embedding_batch_size: int = 64
     ):
         """
         Initialize Resume RAG system.
@@ -33,6 +35,7 @@ class ResumeRAG:
             chunk_size: Size of text chunks for processing
             chunk_overlap: Overlap between chunks
             temperature: LLM temperature (0 for deterministic)
+            embedding_batch_size: Number of chunks sent per embedding request
         """
         self.pdf_path = pdf_path
         self.persist_directory = persist_directory
@@ -41,29 +44,103 @@ class ResumeRAG:
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.temperature = temperature
+        self.embedding_batch_size = embedding_batch_size
+        from langchain_ollama import OllamaEmbeddings
         self.embeddings = OllamaEmbeddings(model=self.embedding_model)
         
         self.vectorstore = None
         self.qa_chain = None
         
+    def _pdf_digest(self) -> str:
+        """Return the SHA-256 hex digest of the PDF file."""
+        sha = hashlib.sha256()
+        with open(self.pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                sha.update(block)
+        return sha.hexdigest()
+
+    def _build_vectorstore(self, texts: List[str], vectors: List[List[float]], metadatas: List[Dict], embeddings) -> "FAISS":
+        """Build a FAISS store over an HNSW graph index for sub-linear nearest-neighbour search."""
+        import faiss
+        import numpy as np
+        from langchain_community.docstore.in_memory import InMemoryDocstore
+        from langchain_community.vectorstores import FAISS
+        from langchain_core.documents import Document
+
+        index = faiss.IndexHNSWFlat(len(vectors[0]), 32)
+        index.hnsw.efConstruction = 200
+        index.add(np.asarray(vectors, dtype="float32"))
+        index.hnsw.efSearch = 64
+
+        ids = [str(uuid.uuid4()) for _ in texts]
+        docstore = InMemoryDocstore({
+            doc_id: Document(page_content=text, metadata=metadata)
+            for doc_id, text, metadata in zip(ids, texts, metadatas)
+        })
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=dict(enumerate(ids))
+        )
+
+    def _load_pdf_pages(self) -> List["Document"]:
+        """Extract one Document per PDF page with PDFium, which is faster and leaner than pypdf."""
+        import pypdfium2 as pdfium
+        from langchain_core.documents import Document
+
+        pdf = pdfium.PdfDocument(self.pdf_path)
+        try:
+            docs = []
+            for i in range(len(pdf)):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                docs.append(Document(
+                    page_content=textpage.get_text_range(),
+                    metadata={"page": i, "source": self.pdf_path}
+                ))
+                textpage.close()
+                page.close()
+            return docs
+        finally:
+            pdf.close()
+
     def load_and_process_document(self) -> None:
-        """Load PDF and create vector store with embeddings."""
+        """Load PDF and create vector store with embeddings.
+
+        A saved index is reused while the PDF's SHA-256 matches the one recorded next to it;
+        otherwise the index is rebuilt, reusing cached embeddings for unchanged chunks.
+        """
+        from langchain_community.vectorstores import FAISS
+
         print("Loading PDF...")
 
         index_path = os.path.join(self.persist_directory, "index.faiss")
-        if os.path.exists(index_path):
+        digest_path = os.path.join(self.persist_directory, "source.sha256")
+        pdf_digest = self._pdf_digest() if os.path.exists(self.pdf_path) else None
+        stored_digest = None
+        if os.path.exists(digest_path):
+            with open(digest_path) as f:
+                stored_digest = f.read().strip()
+
+        if os.path.exists(index_path) and (pdf_digest is None or pdf_digest == stored_digest):
             print(f"Loading existing index from {self.persist_directory}...")
             self.vectorstore = FAISS.load_local(
                 self.persist_directory, 
                 self.embeddings,
                 allow_dangerous_deserialization=True
             )
+            if hasattr(self.vectorstore.index, "hnsw"):
+                self.vectorstore.index.hnsw.efSearch = 64
         else:
-            print("No existing index found. Processing PDF...")
-            if not os.path.exists(self.pdf_path):
+            print("No up-to-date index found. Processing PDF...")
+            if pdf_digest is None:
                 raise FileNotFoundError(f"PDF not found at {self.pdf_path}")
-            loader = PyPDFLoader(self.pdf_path)
-            docs = loader.load()
+            from langchain_classic.embeddings import CacheBackedEmbeddings
+            from langchain_classic.storage import LocalFileStore
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+            docs = self._load_pdf_pages()
         
             # Split documents into chunks
             text_splitter = RecursiveCharacterTextSplitter(
@@ -72,11 +149,24 @@ class ResumeRAG:
             )
             splits = text_splitter.split_documents(docs)
         
-           
-            self.vectorstore = FAISS.from_documents(documents=splits, embedding=self.embeddings)
+            # Memoize chunk embeddings on disk so unchanged chunks are not re-embedded
+            cached_embeddings = CacheBackedEmbeddings.from_bytes_store(
+                self.embeddings,
+                LocalFileStore(os.path.join(self.persist_directory, ".emb_cache")),
+                namespace=self.embedding_model
+            )
+            # Embed chunks in batches rather than one request per chunk
+            texts = [d.page_content for d in splits]
+            metadatas = [d.metadata for d in splits]
+            vectors = []
+            for start in range(0, len(texts), self.embedding_batch_size):
+                vectors.extend(cached_embeddings.embed_documents(texts[start:start + self.embedding_batch_size]))
+            self.vectorstore = self._build_vectorstore(texts, vectors, metadatas, cached_embeddings)
             # Save the index to the local directory
             os.makedirs(self.persist_directory, exist_ok=True)
             self.vectorstore.save_local(self.persist_directory)
+            with open(digest_path, "w") as f:
+                f.write(pdf_digest)
             print(f"Index saved to {self.persist_directory}")
         
     def setup_qa_chain(self) -> None:
@@ -84,6 +174,10 @@ class ResumeRAG:
         if self.vectorstore is None:
             raise ValueError("Must call load_and_process_document() first")
         
+        from langchain_classic.chains import RetrievalQA
+        from langchain_core.prompts import PromptTemplate
+        from langchain_ollama import ChatOllama
+
         # Configure LLM
         llm = ChatOllama(model=self.chat_model, temperature=self.temperature)
         
@@ -98,7 +192,13 @@ Question: {question}
 
 Helpful Answer:"""
         
-        rag_prompt = PromptTemplate.from_template(template)
+        class FastPrompt(PromptTemplate):
+            """Prompt whose fixed template is rendered with a single str.format call."""
+
+            def format(self, **kwargs: Any) -> str:
+                return template.format(context=kwargs["context"], question=kwargs["question"])
+
+        rag_prompt = FastPrompt.from_template(template)
         
         # Create QA chain
         self.qa_chain = RetrievalQA.from_chain_type(
@@ -17,9 +17,32 @@ import sys
 import json
 import requests
 from dotenv import load_dotenv
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 load_dotenv()
 
+# Reused across retries so each attempt skips the TCP/TLS handshake
+_SESSION = requests.Session()
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class RetryableHTTPError(requests.HTTPError):
+    """Raised for throttling and transient server errors that are worth retrying."""
+
+
+@retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential(multiplier=1, min=1, max=16),
+    retry=retry_if_exception_type(RetryableHTTPError),
+    reraise=True,
+)
+def _post(endpoint, headers, payload):
+    resp = _SESSION.post(endpoint, headers=headers, json=payload, timeout=30)
+    if resp.status_code in RETRYABLE_STATUS:
+        raise RetryableHTTPError(f'status={resp.status_code}', response=resp)
+    return resp
+
 
 def build_endpoint(endpoint, deployment, api_version):
     if '/deployments/' in endpoint:
@@ -37,10 +60,11 @@ def call_azure(endpoint, api_key, prompt, deployment=None, api_version='2025-01-
         'max_tokens': 150,
         'temperature': 0.7,
     }
-    resp = requests.post(endpoint, headers=headers, json=payload, timeout=30)
     try:
+        resp = _post(endpoint, headers, payload)
         resp.raise_for_status()
-    except Exception:
+    except requests.HTTPError as e:
+        resp = e.response
         body = resp.text[:1000].replace('\n', ' ')
         print(f'ERROR: request failed status={resp.status_code} body={body}', file=sys.stderr)
         sys.exit(2)
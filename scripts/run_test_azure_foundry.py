@@ -6,10 +6,10 @@ Reads env vars from .env (already loaded by app) or the environment.
 """
 import os
 import sys
-from app import call_openai_api
+from call_Azure_endpoints import call_Azure_openai_api
 
 if __name__ == '__main__':
     prompt = ' '.join(sys.argv[1:]) if len(sys.argv) > 1 else 'Hello from manual test'
     print('Prompt:', prompt)
-    res = call_openai_api(prompt)
+    res = call_Azure_openai_api(prompt)
     print('Response:\n', res)
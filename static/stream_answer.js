@@ -0,0 +1,35 @@
+// Stream the answer as it is generated; without JavaScript the form posts normally.
+document.getElementById('ask-form').addEventListener('submit', async function (event) {
+  event.preventDefault();
+
+  let resp;
+  try {
+    resp = await fetch(this.dataset.streamUrl, { method: 'POST', body: new FormData(this) });
+  } catch (err) {
+    resp = null;
+  }
+  // If the stream endpoint fails, post the form normally so the server renders the answer or error
+  if (!resp || !resp.ok) {
+    this.submit();
+    return;
+  }
+
+  const answer = document.getElementById('answer');
+  answer.textContent = '';
+  document.getElementById('answer-block').hidden = false;
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const events = buffer.split('\n\n');
+    buffer = events.pop();
+    for (const line of events) {
+      const data = line.replace(/^data: /, '');
+      if (data === '[DONE]') return;
+      answer.textContent += JSON.parse(data);
+    }
+  }
+});
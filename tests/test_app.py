@@ -41,3 +41,20 @@ def test_ask_post_empty_question_shows_prompt(client):
     res = client.post('/ask', data={'question': ''})
     assert res.status_code == 200
     assert b'Please enter a question.' in res.data
+
+
+def test_ask_stream_without_key_streams_helpful_message(client, monkeypatch):
+    monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+    monkeypatch.delenv('AZURE_FOUNDRY_MODEL_API_KEY', raising=False)
+    monkeypatch.delenv('AZURE_FOUNDRY_MODEL_ENDPOINT', raising=False)
+    res = client.post('/ask-stream', data={'question': 'Hello AI'})
+    assert res.status_code == 200
+    assert res.mimetype == 'text/event-stream'
+    assert b'No AI API key configured' in res.data
+    assert res.data.endswith(b'data: [DONE]\n\n')
+
+
+def test_resume_ai_stream_empty_question_shows_prompt(client):
+    res = client.post('/resume-ai-stream', data={'question': ''})
+    assert res.status_code == 200
+    assert b'Please enter a question.' in res.data
@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import os
+import orjson
+import pytest
+from urllib.parse import urlparse
+
+# requests, httpx and aiohttp are imported inside the fixtures and tests that use them,
+# so collecting this module stays cheap when the live tests are skipped.
+
+# Response payloads are logged at DEBUG; run pytest with --log-level=DEBUG to see them
+log = logging.getLogger(__name__)
+
+# (connect, read) timeouts: connect just over the 3s TCP SYN retransmit so a dead endpoint fails fast
+_CONNECT_TIMEOUT, _READ_TIMEOUT = 3.05, 30
+
+# Parallel requests fired by the concurrency smoke test
+_CONCURRENT_REQUESTS = 10
+
+# Generation settings shared by every request
+_PAYLOAD_TEMPLATE = {'max_tokens': 50, 'temperature': 0.2}
+
+# Request body encoded once and sent as-is by the fixed-prompt tests
+_PAYLOAD = {**_PAYLOAD_TEMPLATE, 'messages': [{'role': 'user', 'content': 'Hello from pytest'}]}
+_PAYLOAD_BYTES = orjson.dumps(_PAYLOAD)
+
+
+_NL_TAB = str.maketrans('\n\r\t', '   ')
+
+
+def _body_excerpt(body):
+    """First 500 bytes of a response body on one line, without charset detection."""
+    return body[:500].decode('utf-8', 'replace').translate(_NL_TAB)
+
+
+def _check_status(status, body):
+    """Fail the test with the body excerpt unless the status is 2xx."""
+    if not (200 <= status < 300):
+        pytest.fail(f'Azure Foundry call failed (status={status}): {_body_excerpt(body)}')
+
+
+def _answer_content(body):
+    """Return the assistant content from a chat completion body, failing with the raw body if it is malformed."""
+    data = orjson.loads(body)
+    log.debug('Full response: %s', data)
+    try:
+        content = data['choices'][0]['message']['content']
+    except (KeyError, IndexError, TypeError) as e:
+        pytest.fail(f'Unexpected response shape ({e}): {_body_excerpt(body)}')
+    assert isinstance(content, str) and content
+    return content
+
+
+@pytest.fixture(scope="session")
+def foundry_session():
+    """Keep-alive session shared by every Azure Foundry call in the test run."""
+    requests = pytest.importorskip('requests')
+    from urllib3.util.retry import Retry
+
+    if os.environ.get('FOUNDRY_CACHE') == '1':
+        # Dev-only: replay identical POSTs from a local SQLite cache instead of re-hitting the paid endpoint
+        requests_cache = pytest.importorskip('requests_cache')
+        session = requests_cache.CachedSession(
+            '.foundry_cache',
+            backend='sqlite',
+            allowable_methods=('POST',),
+            cache_control=False,
+            expire_after=3600,
+        )
+    else:
+        session = requests.Session()
+    session.mount("https://", requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=10,
+        max_retries=Retry(total=3, read=False, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504], allowed_methods={'POST'}),
+    ))
+    yield session
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def foundry_http2_client():
+    """HTTP/2 client that multiplexes Azure Foundry calls over one TLS connection."""
+    httpx = pytest.importorskip('httpx')
+    pytest.importorskip('h2')
+    client = httpx.Client(
+        http2=True,
+        timeout=httpx.Timeout(_READ_TIMEOUT, connect=_CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_keepalive_connections=10),
+    )
+    yield client
+    client.close()
+
+
+@pytest.fixture(scope="module")
+def aio_session():
+    """Event loop and aiohttp session shared by the async tests, so DNS and TLS are set up once.
+
+    pytest-asyncio is not a dependency, so the fixture owns the loop the tests run on.
+    """
+    aiohttp = pytest.importorskip('aiohttp')
+    loop = asyncio.new_event_loop()
+
+    async def open_session():
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=20,
+            use_dns_cache=True,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        return aiohttp.ClientSession(connector=connector)
+
+    session = loop.run_until_complete(open_session())
+    yield loop, session
+    loop.run_until_complete(session.close())
+    loop.close()
+
+
+@pytest.fixture(scope="module")
+def foundry_config():
+    """Resolve the chat/completions URL and request headers once, skipping when config is missing."""
+    endpoint = os.environ.get('AZURE_FOUNDRY_MODEL_ENDPOINT')
+    api_key = os.environ.get('AZURE_FOUNDRY_MODEL_API_KEY')
+    deployment = os.environ.get('AZURE_FOUNDRY_MODEL_DEPLOYMENT')
+    api_version = os.environ.get('AZURE_FOUNDRY_MODEL_API_VERSION', '2025-01-01-preview')
+
+    if not (endpoint and api_key):
+        pytest.skip('AZURE_FOUNDRY_MODEL_ENDPOINT and AZURE_FOUNDRY_MODEL_API_KEY must be set')
+
+    # Only a deployments path counts; the same text in a query string must not
+    if not urlparse(endpoint).path.startswith('/openai/deployments/'):
+        if not deployment:
+            pytest.skip('AZURE_FOUNDRY_MODEL_DEPLOYMENT is required when endpoint is a base URL')
+        endpoint = endpoint.rstrip('/') + f"/openai/deployments/{deployment}/chat/completions?api-version={api_version}"
+
+    return endpoint, {'api-key': api_key, 'Content-Type': 'application/json'}
+
+
+@pytest.mark.skipif(os.environ.get('RUN_AZURE_TEST') != '1', reason='Set RUN_AZURE_TEST=1 to call the live Azure Foundry endpoint')
+@pytest.mark.parametrize('prompt', ['ping', 'hello', 'ready?'])
+def test_azure_foundry_direct_call(foundry_config, foundry_session, prompt):
+    endpoint, headers = foundry_config
+    payload = orjson.dumps({**_PAYLOAD_TEMPLATE, 'messages': [{'role': 'user', 'content': prompt}]})
+
+    resp = foundry_session.post(endpoint, headers=headers, data=payload, timeout=(_CONNECT_TIMEOUT, _READ_TIMEOUT))
+    _check_status(resp.status_code, resp.content)
+
+    _answer_content(resp.content)
+
+
+@pytest.mark.skipif(os.environ.get('RUN_AZURE_TEST') != '1', reason='Set RUN_AZURE_TEST=1 to call the live Azure Foundry endpoint')
+def test_azure_foundry_http2_call(foundry_config, foundry_http2_client):
+    endpoint, headers = foundry_config
+
+    resp = foundry_http2_client.post(endpoint, headers=headers, content=_PAYLOAD_BYTES)
+    _check_status(resp.status_code, resp.content)
+
+    _answer_content(resp.content)
+
+
+@pytest.mark.skipif(os.environ.get('RUN_AZURE_TEST') != '1', reason='Set RUN_AZURE_TEST=1 to call the live Azure Foundry endpoint')
+def test_azure_foundry_concurrent(foundry_config, aio_session):
+    aiohttp = pytest.importorskip('aiohttp')
+    loop, session = aio_session
+    endpoint, headers = foundry_config
+
+    async def call():
+        async with session.post(endpoint, headers=headers, data=_PAYLOAD_BYTES, timeout=aiohttp.ClientTimeout(sock_connect=_CONNECT_TIMEOUT, sock_read=_READ_TIMEOUT)) as resp:
+            return resp.status, await resp.read()
+
+    async def run():
+        return await asyncio.gather(*[call() for _ in range(_CONCURRENT_REQUESTS)])
+
+    results = loop.run_until_complete(run())
+
+    for status, body in results:
+        _check_status(status, body)
+        _answer_content(body)
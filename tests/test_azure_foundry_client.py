@@ -0,0 +1,113 @@
+import os
+import sys
+import threading
+import time
+
+import pytest
+from urllib3.exceptions import ReadTimeoutError
+
+# Ensure the project root is on sys.path so pytest can import azure_foundry_client.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from azure_foundry_client import AzureFoundryClient, create_session, iter_stream_content
+from llm_cache import TTLCache
+
+
+def test_create_session_retries_throttled_posts():
+    retry = create_session().get_adapter('https://example.com').max_retries
+    assert retry.is_retry('POST', 429)
+    assert retry.is_retry('POST', 503)
+    assert not retry.is_retry('POST', 400)
+
+
+def test_create_session_does_not_retry_post_read_timeouts():
+    retry = create_session().get_adapter('https://example.com').max_retries
+    with pytest.raises(ReadTimeoutError):
+        retry.increment(method='POST', url='/chat/completions', error=ReadTimeoutError(None, '/chat/completions', 'timed out'))
+
+
+class _StreamedResponse:
+    """Minimal stand-in for a streamed requests.Response."""
+
+    def __init__(self, body: bytes):
+        self._body = body
+
+    def iter_lines(self):
+        return iter(self._body.split(b'\n'))
+
+
+def test_iter_stream_content_decodes_utf8_deltas():
+    body = (
+        'data: {"choices": [{"delta": {"content": "Café "}}]}\n'
+        '\n'
+        ': keep-alive\n'
+        'data: {"choices": [{"delta": {"content": "東京"}}]}\n'
+        'data: [DONE]\n'
+        'data: {"choices": [{"delta": {"content": "ignored"}}]}\n'
+    ).encode('utf-8')
+
+    assert list(iter_stream_content(_StreamedResponse(body))) == ['Café ', '東京']
+
+
+class _BlockingSession:
+    """Session stub whose POSTs wait for the test to release them, so identical calls overlap."""
+
+    def __init__(self, body: bytes = None, error: Exception = None):
+        self.posts = 0
+        self.release = threading.Event()
+        self._body = body
+        self._error = error
+
+    def post(self, *args, **kwargs):
+        self.posts += 1
+        self.release.wait(5)
+        if self._error is not None:
+            raise self._error
+        resp = _StreamedResponse(self._body)
+        resp.status_code = 200
+        resp.content = self._body
+        return resp
+
+
+def _call_concurrently(monkeypatch, session, n=5):
+    monkeypatch.setattr(AzureFoundryClient, '_session', session)
+    monkeypatch.setattr(AzureFoundryClient, '_cache', TTLCache(maxsize=16, ttl=60))
+    client = AzureFoundryClient(endpoint='https://example.com/openai/deployments/d/chat/completions', api_key='k')
+    results = [None] * n
+
+    def worker(i):
+        try:
+            results[i] = client.call('same prompt')
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    # Give every thread time to reach the in-flight registry before the first POST returns
+    time.sleep(0.2)
+    session.release.set()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_identical_concurrent_calls_share_one_post(monkeypatch):
+    session = _BlockingSession(body=b'{"choices": [{"message": {"content": "pong"}}]}')
+
+    results = _call_concurrently(monkeypatch, session)
+
+    assert session.posts == 1
+    assert results == ['pong'] * 5
+    assert AzureFoundryClient._inflight == {}
+
+
+def test_identical_concurrent_calls_all_see_the_failure(monkeypatch):
+    error = ConnectionError('connection reset')
+    session = _BlockingSession(error=error)
+
+    results = _call_concurrently(monkeypatch, session)
+
+    assert session.posts == 1
+    assert all(result is error for result in results)
+    assert AzureFoundryClient._inflight == {}
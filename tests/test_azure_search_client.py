@@ -0,0 +1,239 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from azure.core.credentials import AccessToken
+from azure.search.documents.models import IndexAction
+
+# Ensure the project root is on sys.path so pytest can import azure_search_client.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import azure_search_client
+from azure_search_client import AzureSearchRAGClient, CachingTokenCredential
+from llm_cache import SemanticCache
+from rate_limit import RateLimiter
+
+
+def _bare_client():
+    """A client with no Azure connections, for exercising methods with stubbed collaborators."""
+    return AzureSearchRAGClient.__new__(AzureSearchRAGClient)
+
+
+def test_batch_answer_keeps_order_and_caps_concurrency():
+    client = _bare_client()
+    lock = threading.Lock()
+    in_flight = 0
+    peak = 0
+
+    def generate_answer(query, top=3, query_embedding=None):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later questions finish first, so ordering must come from batch_answer itself
+        time.sleep(0.05 / (int(query[1:]) + 1))
+        with lock:
+            in_flight -= 1
+        return {"answer": query.upper(), "top": top}
+
+    client.generate_answer = generate_answer
+    client.embedding_deployment = ""
+    queries = [f"q{i}" for i in range(8)]
+
+    results = client.batch_answer(queries, top=2, max_concurrency=3)
+
+    assert results == [{"answer": q.upper(), "top": 2} for q in queries]
+    assert 1 < peak <= 3
+
+
+def test_batch_answer_embeds_all_questions_in_one_request():
+    client = _bare_client()
+    client.embedding_deployment = "embed"
+    embed_calls = []
+    answered = {}
+
+    def embed_batch(texts):
+        embed_calls.append(list(texts))
+        return [[float(i)] for i in range(len(texts))]
+
+    def generate_answer(query, top=3, query_embedding=None):
+        answered[query] = query_embedding
+        return {"answer": query}
+
+    client.embed_batch = embed_batch
+    client.generate_answer = generate_answer
+
+    client.batch_answer(["a", "b", "c"])
+
+    assert embed_calls == [["a", "b", "c"]]
+    assert answered == {"a": [0.0], "b": [1.0], "c": [2.0]}
+
+
+_DOCS = [
+    {"source_file": "resume.pdf", "content": "Alex led the data platform team."},
+    {"source_file": "projects.md", "content": "Alex built a RAG search service."},
+    {"source_file": "bio.txt", "content": "Alex lives in Seattle."},
+    {"source_file": "talks.md", "content": "Alex spoke about vector search."},
+]
+
+
+def _prepare_client(monkeypatch, search_results, embeddings):
+    """A bare client whose search returns search_results[query] and whose cache embedding is embeddings[query]."""
+    monkeypatch.setattr(azure_search_client, "count_tokens", lambda text, model="gpt-4": len(text.split()))
+    monkeypatch.setattr(azure_search_client, "truncate_and_count", lambda text, limit, model="gpt-4": (text, len(text.split())))
+    monkeypatch.setattr(azure_search_client, "_system_prompt_tokens", lambda: 10)
+    monkeypatch.setattr(azure_search_client, "_RATE_LIMITER", RateLimiter(requests_per_minute=1000, tokens_per_minute=10**6))
+
+    client = _bare_client()
+    client.search = lambda query, top: search_results[query]
+    client._embed_for_cache = lambda query: embeddings[query]
+    client._sem_cache = SemanticCache(threshold=0.93)
+    client._executor = ThreadPoolExecutor(max_workers=1)
+    client.context_token_budget = 1000
+    client.max_answer_tokens = 100
+    return client
+
+
+def test_prepare_reuses_answer_for_paraphrase_with_same_grounding(monkeypatch):
+    client = _prepare_client(
+        monkeypatch,
+        search_results={"What does Alex do?": _DOCS[:3], "What is Alex's job?": _DOCS[:3]},
+        embeddings={"What does Alex do?": [1.0, 0.0], "What is Alex's job?": [0.99, 0.05]},
+    )
+    cached, messages, cache_entry = client._prepare("What does Alex do?", 3)
+    assert cached is None and messages is not None
+    client._remember(cache_entry, {"answer": "Alex leads a data platform team."})
+
+    cached, messages, _ = client._prepare("What is Alex's job?", 3)
+
+    assert cached == {"answer": "Alex leads a data platform team."}
+    assert messages is None
+
+
+def test_prepare_misses_when_paraphrase_retrieves_different_documents(monkeypatch):
+    client = _prepare_client(
+        monkeypatch,
+        search_results={"What does Alex do?": _DOCS[:3], "What is Alex's job?": _DOCS[1:]},
+        embeddings={"What does Alex do?": [1.0, 0.0], "What is Alex's job?": [0.99, 0.05]},
+    )
+    _, _, cache_entry = client._prepare("What does Alex do?", 3)
+    client._remember(cache_entry, {"answer": "Alex leads a data platform team."})
+
+    cached, messages, _ = client._prepare("What is Alex's job?", 3)
+
+    assert cached is None
+    assert "Alex spoke about vector search." in messages[1]["content"]
+
+
+def test_prepare_builds_the_same_context_for_reordered_hits(monkeypatch):
+    client = _prepare_client(
+        monkeypatch,
+        search_results={"ranked": _DOCS[:3], "reranked": [_DOCS[2], _DOCS[0], _DOCS[1]]},
+        embeddings={"ranked": None, "reranked": None},
+    )
+
+    _, ranked, _ = client._prepare("ranked", 3)
+    _, reranked, _ = client._prepare("reranked", 3)
+
+    assert ranked[1]["content"].split("\n\nQuestion:")[0] == reranked[1]["content"].split("\n\nQuestion:")[0]
+
+
+class _StubSender:
+    """Stands in for SearchIndexingBufferedSender, failing documents marked 'bad'."""
+
+    def __init__(self, **kwargs):
+        self.on_error = kwargs["on_error"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def upload_documents(self, documents):
+        for doc in documents:
+            if doc.get("bad"):
+                self.on_error(IndexAction(additional_properties=doc, action_type="upload"))
+
+
+def _upload_client():
+    client = _bare_client()
+    client.search_endpoint = "https://search.example"
+    client.search_index = "resume"
+    client._search_credential = None
+    return client
+
+
+def test_upload_documents_reports_failed_keys(monkeypatch):
+    monkeypatch.setattr(azure_search_client, "SearchIndexingBufferedSender", _StubSender)
+
+    with pytest.raises(RuntimeError, match=r"2 document\(s\): \['b', 'd'\]"):
+        _upload_client().upload_documents([
+            {"id": "a"}, {"id": "b", "bad": True}, {"id": "c"}, {"id": "d", "bad": True},
+        ])
+
+
+def test_upload_documents_succeeds_without_failures(monkeypatch):
+    monkeypatch.setattr(azure_search_client, "SearchIndexingBufferedSender", _StubSender)
+
+    _upload_client().upload_documents([{"id": "a"}, {"id": "b"}])
+
+
+def test_stream_rag_api_caches_the_joined_answer(monkeypatch):
+    calls = []
+
+    class StubClient:
+        def stream_answer(self, prompt):
+            calls.append(prompt)
+            yield "Hello, "
+            yield "world"
+
+    monkeypatch.setattr(azure_search_client, "get_rag_client", StubClient)
+    monkeypatch.setattr(azure_search_client, "_ANSWER_CACHE", azure_search_client.TTLCache(maxsize=4, ttl=60))
+
+    assert list(azure_search_client.stream_Rag_api("hi")) == ["Hello, ", "world"]
+    assert list(azure_search_client.stream_Rag_api("hi")) == ["Hello, world"]
+    assert azure_search_client.call_Rag_api("hi") == {"answer": "Hello, world"}
+    assert calls == ["hi"]
+
+
+class _CountingCredential:
+    """Credential stub that issues a new token, valid for expires_in seconds, on every call."""
+
+    def __init__(self, expires_in):
+        self.calls = []
+        self._expires_in = expires_in
+
+    def get_token(self, *scopes, **kwargs):
+        self.calls.append((scopes, kwargs))
+        return AccessToken(f"token-{len(self.calls)}", int(time.time()) + self._expires_in)
+
+
+def test_caching_credential_reuses_token_until_refresh_margin():
+    fresh = CachingTokenCredential(_CountingCredential(expires_in=3600), refresh_margin=300)
+    assert fresh.get_token("scope") is fresh.get_token("scope")
+    assert len(fresh._inner.calls) == 1
+
+    # A token expiring inside the refresh margin is replaced on the next request
+    expiring = CachingTokenCredential(_CountingCredential(expires_in=60), refresh_margin=300)
+    assert expiring.get_token("scope").token == "token-1"
+    assert expiring.get_token("scope").token == "token-2"
+
+
+def test_caching_credential_keys_tokens_by_cae_and_bypasses_cache_for_claims():
+    inner = _CountingCredential(expires_in=3600)
+    credential = CachingTokenCredential(inner)
+
+    plain = credential.get_token("scope")
+    cae = credential.get_token("scope", enable_cae=True)
+    assert plain.token != cae.token
+    assert credential.get_token("scope", enable_cae=True) is cae
+
+    # A claims challenge always goes to the inner credential and is not cached
+    challenged = credential.get_token("scope", enable_cae=True, claims='{"access_token": {}}')
+    assert challenged.token == "token-3"
+    assert credential.get_token("scope", enable_cae=True) is cae
+    assert len(inner.calls) == 3
@@ -0,0 +1,69 @@
+import asyncio
+import os
+import sys
+
+import httpx
+import orjson
+
+# Ensure the project root is on sys.path so pytest can import call_Azure_endpoints.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import call_Azure_endpoints
+from azure_foundry_client import AzureFoundryClient
+from call_Azure_endpoints import AsyncAzureOpenAIWrapper, call_Azure_openai_api
+
+
+def _openai_only(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    monkeypatch.delenv('AZURE_FOUNDRY_MODEL_API_KEY', raising=False)
+    monkeypatch.delenv('AZURE_FOUNDRY_MODEL_ENDPOINT', raising=False)
+    # tiktoken downloads its encoding on first use; a word count keeps the test offline
+    monkeypatch.setattr(call_Azure_endpoints, 'count_tokens', lambda text: len(text.split()))
+
+
+def _call(handler, prompt):
+    async def run():
+        wrapper = AsyncAzureOpenAIWrapper(transport=httpx.MockTransport(handler))
+        try:
+            return await wrapper.call(prompt)
+        finally:
+            await wrapper.aclose()
+    return asyncio.run(run())
+
+
+def test_async_wrapper_calls_openai(monkeypatch):
+    _openai_only(monkeypatch)
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={'choices': [{'message': {'content': 'pong'}}]})
+
+    assert _call(handler, 'ping') == 'pong'
+    assert seen[0].headers['Authorization'] == 'Bearer sk-test'
+    assert orjson.loads(seen[0].content)['messages'] == [{'role': 'user', 'content': 'ping'}]
+
+
+def test_async_wrapper_reports_openai_errors(monkeypatch):
+    _openai_only(monkeypatch)
+
+    def handler(request):
+        return httpx.Response(500, content=b'boom')
+
+    assert _call(handler, 'ping') == 'Failed to fetch response from OpenAI.'
+
+
+def test_foundry_calls_reuse_one_client_per_endpoint(monkeypatch):
+    monkeypatch.setenv('AZURE_FOUNDRY_MODEL_ENDPOINT', 'https://foundry.example/openai/deployments/gpt/chat/completions')
+    monkeypatch.setenv('AZURE_FOUNDRY_MODEL_API_KEY', 'key')
+    clients = []
+
+    def call(self, prompt, **kwargs):
+        clients.append(self)
+        return f'echo {prompt}'
+
+    monkeypatch.setattr(AzureFoundryClient, 'call', call)
+
+    assert call_Azure_openai_api('a') == 'echo a'
+    assert call_Azure_openai_api('b') == 'echo b'
+    assert clients[0] is clients[1]
@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+# Ensure the project root is on sys.path so pytest can import config.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config import settings
+
+
+def test_settings_reads_rate_limits_and_ignores_malformed_values(monkeypatch):
+    monkeypatch.setenv('OPENAI_RPM', '"120"')
+    monkeypatch.setenv('OPENAI_TPM', 'lots')
+    settings.cache_clear()
+    try:
+        with pytest.warns(UserWarning, match='OPENAI_TPM'):
+            cfg = settings()
+        assert cfg.openai_rpm == 120
+        assert cfg.openai_tpm == 40000
+    finally:
+        settings.cache_clear()
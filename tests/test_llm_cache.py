@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Ensure the project root is on sys.path so pytest can import llm_cache.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from llm_cache import SemanticCache, TTLCache, make_key
+
+
+def test_make_key_is_order_independent():
+    assert make_key(m='gpt', t=0.7) == make_key(t=0.7, m='gpt')
+    assert make_key(m='gpt', t=0.7) != make_key(m='gpt', t=0.2)
+
+
+def test_ttl_cache_returns_stored_value():
+    cache = TTLCache(maxsize=4, ttl=60)
+    cache.set('k', 'answer')
+    assert cache.get('k') == 'answer'
+    assert cache.get('missing') is None
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=4, ttl=-1)
+    cache.set('k', 'answer')
+    assert cache.get('k') is None
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+
+
+def test_semantic_cache_hits_similar_embeddings_only():
+    cache = SemanticCache(threshold=0.9)
+    cache.set([1.0, 0.0, 0.0], 'cached answer')
+    assert cache.get([0.99, 0.05, 0.0]) == 'cached answer'
+    assert cache.get([0.0, 1.0, 0.0]) is None
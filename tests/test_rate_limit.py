@@ -0,0 +1,54 @@
+import asyncio
+import os
+import sys
+import time
+
+# Ensure the project root is on sys.path so pytest can import rate_limit.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from rate_limit import RateLimiter, request_cost
+
+
+def test_acquire_within_budget_does_not_wait():
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=1000)
+    start = time.monotonic()
+    for _ in range(5):
+        limiter.acquire(100)
+    assert time.monotonic() - start < 0.5
+
+
+def test_acquire_waits_for_token_refill():
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=6000)
+    limiter.acquire(6000)
+    start = time.monotonic()
+    limiter.acquire(10)
+    assert time.monotonic() - start >= 0.09
+
+
+def test_aacquire_waits_for_token_refill_without_blocking():
+    limiter = RateLimiter(requests_per_minute=6000, tokens_per_minute=6000)
+    limiter.acquire(6000)
+
+    async def run():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        start = time.monotonic()
+        await limiter.aacquire(10)
+        elapsed = time.monotonic() - start
+        task.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(run())
+    assert elapsed >= 0.09
+    assert ticks > 1
+
+
+def test_request_cost_includes_generation_cap():
+    assert request_cost(100, 256) == 356
@@ -0,0 +1,35 @@
+import os
+import sys
+
+import pytest
+import tiktoken
+
+# Ensure the project root is on sys.path so pytest can import tokens.py
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import tokens
+
+
+@pytest.fixture
+def offline_encoder(monkeypatch):
+    def fail(model):
+        raise ConnectionError('no network')
+
+    monkeypatch.setattr(tiktoken, 'encoding_for_model', fail)
+    tokens.get_encoder.cache_clear()
+    yield
+    tokens.get_encoder.cache_clear()
+
+
+def test_count_tokens_estimates_when_encoder_cannot_load(offline_encoder):
+    assert tokens.count_tokens('x' * 10) == 3
+    assert tokens.count_tokens('') == 0
+
+
+def test_truncate_tokens_estimates_when_encoder_cannot_load(offline_encoder):
+    assert tokens.truncate_tokens('abcdefghij', 2) == 'abcdefgh'
+
+
+def test_truncate_and_count_reports_kept_tokens(offline_encoder):
+    assert tokens.truncate_and_count('abcdefghij', 2) == ('abcdefgh', 2)
+    assert tokens.truncate_and_count('abc', 2) == ('abc', 1)
@@ -0,0 +1,83 @@
+"""Token counting helpers for prompt budgeting."""
+
+import functools
+from typing import Optional, Tuple
+
+import tiktoken
+
+# Rough characters-per-token ratio for English text, used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoder(model: str = "gpt-4") -> Optional[tiktoken.Encoding]:
+    """
+    Return the (cached) tiktoken encoder for a model.
+
+    tiktoken downloads its encoding files on first use; if that fails the helpers below fall
+    back to a character-based estimate, so budgeting can never fail the request itself.
+
+    Returns:
+        The encoder, or None if it could not be loaded
+    """
+    try:
+        return tiktoken.encoding_for_model(model)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4") -> int:
+    """
+    Count the tokens in a piece of text.
+
+    Args:
+        text: Text to tokenize
+        model: Model whose tokenizer to use
+
+    Returns:
+        Number of tokens (estimated from the text length if the tokenizer is unavailable)
+    """
+    encoder = get_encoder(model)
+    if encoder is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoder.encode(text))
+
+
+def truncate_tokens(text: str, limit: int, model: str = "gpt-4") -> str:
+    """
+    Truncate text to at most limit tokens.
+
+    Args:
+        text: Text to truncate
+        limit: Maximum number of tokens to keep
+        model: Model whose tokenizer to use
+
+    Returns:
+        The text unchanged if it fits, otherwise its first limit tokens decoded back to text
+    """
+    return truncate_and_count(text, limit, model)[0]
+
+
+def truncate_and_count(text: str, limit: int, model: str = "gpt-4") -> Tuple[str, int]:
+    """
+    Truncate text to at most limit tokens and report how many tokens were kept.
+
+    Encodes the text once, so callers that need both the trimmed text and its size
+    do not tokenize it again.
+
+    Args:
+        text: Text to truncate
+        limit: Maximum number of tokens to keep
+        model: Model whose tokenizer to use
+
+    Returns:
+        Tuple of (possibly truncated text, its token count)
+    """
+    encoder = get_encoder(model)
+    if encoder is None:
+        text = text[:limit * CHARS_PER_TOKEN]
+        return text, -(-len(text) // CHARS_PER_TOKEN)
+    tokens = encoder.encode(text)
+    if len(tokens) <= limit:
+        return text, len(tokens)
+    return encoder.decode(tokens[:limit]), limit